@@ -1,17 +1,43 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
+import importlib
 import io
+import csv
+import re
+import bisect
+import heapq
+import os
+import json
+import hmac
 import base64
-import time
+import hashlib
+import secrets
+import random
+import zlib
+
+class LazyModule:
+    """Module proxy that defers the import until first attribute access"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# Heavy libraries are only needed once a dashboard tab renders, not for the login page
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+px = LazyModule("plotly.express")
 
 # ======================================
 # ENTERPRISE CONFIGURATION
 # ======================================
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 st.set_page_config(
     page_title="ARMS Workflow Management",
     page_icon="🚀",
@@ -20,120 +46,147 @@ st.set_page_config(
 )
 
 # Professional Enterprise Styling
-st.markdown("""
-<style>
-    /* Main Theme */
-    .main {
-        background-color: #f8f9fa;
-    }
-    
-    /* Enterprise Header */
-    .enterprise-header {
-        background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
-        color: white;
-        padding: 1.5rem 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        border-bottom: 4px solid #2980b9;
-    }
-    
-    /* Power BI-like Cards */
-    .powerbi-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.08);
-        border: 1px solid #e1e8ed;
-        margin-bottom: 1rem;
-    }
-    
-    /* Metric Cards */
-    .metric-card-enterprise {
-        background: linear-gradient(135deg, #3498db 0%, #2980b9 100%);
-        color: white;
-        padding: 1.2rem;
-        border-radius: 8px;
-        text-align: center;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        border: 1px solid #2c3e50;
-    }
-    
-    .metric-value-enterprise {
-        font-size: 2.2rem;
-        font-weight: 700;
-        color: #ffffff;
-        margin: 0.5rem 0;
-    }
-    
-    .metric-label-enterprise {
-        font-size: 0.9rem;
-        color: #ecf0f1;
-        font-weight: 600;
-        text-transform: uppercase;
-    }
-    
-    /* Status badges */
-    .status-badge {
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-size: 0.75rem;
-        font-weight: 600;
-        display: inline-block;
-    }
-    
-    .status-pending { background: #fff3cd; color: #856404; }
-    .status-in-progress { background: #d1ecf1; color: #0c5460; }
-    .status-completed { background: #d4edda; color: #155724; }
-    .status-under-review { background: #f8d7da; color: #721c24; }
-    .status-paused { background: #e2e3e5; color: #383d41; }
-    
-    .priority-critical { background: #f8d7da; color: #721c24; }
-    .priority-high { background: #f8d7da; color: #721c24; }
-    .priority-medium { background: #fff3cd; color: #856404; }
-    .priority-low { background: #d1ecf1; color: #0c5460; }
-    
-    /* Login Styling */
-    .login-container {
-        max-width: 400px;
-        margin: 100px auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 10px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-    }
-</style>
-""", unsafe_allow_html=True)
+STYLESHEET_PATH = os.path.join(APP_DIR, "static", "arms.css")
+
+@st.cache_resource
+def load_stylesheet(path=STYLESHEET_PATH):
+    """Read and minify the stylesheet once per process"""
+    with open(path, encoding="utf-8") as f:
+        css = f.read()
+    # Only comments and whitespace runs are dropped; spacing can be significant in selectors
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return f"<style>{css.strip()}</style>"
+
+st.markdown(load_stylesheet(), unsafe_allow_html=True)
+
+# ======================================
+# WORKFLOW DEFINITIONS
+# ======================================
+
+# Pre-defined workflows based on your requirements
+PREDEFINED_WORKFLOWS = [
+    {"Workflow Name": "Trades Tape Imports", "Workflow Type": "Volume", "Target Metric": "Completion %", 
+     "Measurement Unit": "Batches", "Monthly Target": "100%", "Priority": "High", "SLA Hours": 24, "Quality Required?": "Yes"},
+    {"Workflow Name": "Pending", "Workflow Type": "Volume", "Target Metric": "Completion %", 
+     "Measurement Unit": "Items", "Monthly Target": "100%", "Priority": "High", "SLA Hours": 72, "Quality Required?": "Yes"},
+    {"Workflow Name": "Placements", "Workflow Type": "Target", "Target Metric": "Placements", 
+     "Measurement Unit": "Cases", "Monthly Target": "50", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
+    {"Workflow Name": "Judgments", "Workflow Type": "Target", "Target Metric": "Accuracy %", 
+     "Measurement Unit": "Judgments", "Monthly Target": "98%", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
+    {"Workflow Name": "UCC", "Workflow Type": "Target", "Target Metric": "UCC Filings", 
+     "Measurement Unit": "Filings", "Monthly Target": "30", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
+]
+
+DEFAULT_WORKFLOW = "Pending"
 
 # ======================================
 # AUTHENTICATION SYSTEM
 # ======================================
 
-USERS = {
-    "admin": {"password": "admin123", "role": "manager", "name": "System Administrator"},
-    "nisarg": {"password": "nisarg123", "role": "analyst", "name": "Nisarg Thakker"},
-    "komal": {"password": "komal123", "role": "analyst", "name": "Komal Khamar"},
-    "ayushi": {"password": "ayushi123", "role": "analyst", "name": "Ayushi Chandel"},
-    "jen": {"password": "jen123", "role": "analyst", "name": "Jen Shears"},
-    "rondrea": {"password": "rondrea123", "role": "analyst", "name": "Rondrea Carroll"},
-    "devanshi": {"password": "devanshi123", "role": "analyst", "name": "Devanshi Joshi"},
-    "divyesh": {"password": "divyesh123", "role": "analyst", "name": "Divyesh Fofandi"},
-    "parth": {"password": "parth123", "role": "analyst", "name": "Parth Chelani"},
-    "prerna": {"password": "prerna123", "role": "analyst", "name": "Prerna Kesrani"},
-    "ankit": {"password": "ankit123", "role": "analyst", "name": "Ankit Rawat"}
-}
+USER_STORE_PATH = os.environ.get("ARMS_USER_STORE", os.path.join(APP_DIR, "users.json"))
 
-ANALYSTS = [
-    "Nisarg Thakker", "Jen Shears", "Komal Khamar", "Rondrea Carroll", 
-    "Devanshi Joshi", "Divyesh Fofandi", "Parth Chelani", "Prerna Kesrani", 
-    "Ayushi Chandel", "Ankit Rawat"
-]
+# PBKDF2-SHA256 work factor; stored per hash so it can be raised without invalidating existing users
+PASSWORD_HASH_ITERATIONS = 600_000
+SESSION_TOKEN_TTL = timedelta(hours=8)
+
+def hash_password(password, iterations=PASSWORD_HASH_ITERATIONS):
+    """Salted PBKDF2 hash in the form pbkdf2_sha256$iterations$salt$hash"""
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${base64.b64encode(salt).decode()}${base64.b64encode(digest).decode()}"
+
+def verify_password(password, password_hash):
+    # A malformed stored hash fails verification rather than crashing the login
+    try:
+        algorithm, iterations, salt, expected = password_hash.split("$")
+        if algorithm != "pbkdf2_sha256":
+            return False
+        salt = base64.b64decode(salt, validate=True)
+        expected = base64.b64decode(expected, validate=True)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, int(iterations))
+    except (AttributeError, ValueError, OverflowError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+@st.cache_resource
+def get_dummy_password_hash():
+    """Verified against when the username is unknown, so failed logins cost the same either way"""
+    return hash_password(secrets.token_hex(16))
+
+@st.cache_resource
+def load_user_store(path=USER_STORE_PATH):
+    """Users keyed by username: {"name", "role", "password_hash"}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["users"]
+
+def get_analysts():
+    return [user["name"] for user in load_user_store().values() if user["role"] == "analyst"]
+
+@st.cache_resource
+def get_session_secret():
+    """Signing key for session tokens; random per server process unless configured"""
+    secret = os.environ.get("ARMS_SESSION_SECRET")
+    return secret.encode("utf-8") if secret else secrets.token_bytes(32)
 
 def authenticate(username, password):
-    if username in USERS and USERS[username]["password"] == password:
-        return USERS[username]
+    users = load_user_store()
+    user = users.get(username)
+    if user is None:
+        verify_password(password, get_dummy_password_hash())
+        return None
+    if verify_password(password, user["password_hash"]):
+        return user
     return None
 
+def issue_session_token(username):
+    """Signed token: base64(username|expiry).hmac"""
+    expires_at = int((datetime.now() + SESSION_TOKEN_TTL).timestamp())
+    payload = base64.urlsafe_b64encode(f"{username}|{expires_at}".encode("utf-8")).decode()
+    signature = hmac.new(get_session_secret(), payload.encode(), hashlib.sha256).hexdigest()
+    return f"{payload}.{signature}"
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def decode_session_token(token):
+    """Verify a token's signature; returns (username, expires_at) or None. Cached per token"""
+    payload, _, signature = token.partition(".")
+    expected = hmac.new(get_session_secret(), payload.encode(), hashlib.sha256).hexdigest()
+    # compare_digest rejects non-ASCII str, so compare the encoded bytes
+    if not hmac.compare_digest(signature.encode("utf-8"), expected.encode("utf-8")):
+        return None
+    try:
+        username, expires_at = base64.urlsafe_b64decode(payload.encode()).decode("utf-8").rsplit("|", 1)
+        return username, int(expires_at)
+    except ValueError:
+        return None
+
+def get_session_user():
+    """User for the current session token, or None; expiry is checked on every rerun"""
+    token = st.session_state.get("session_token")
+    if not token:
+        return None
+    claims = decode_session_token(token)
+    if claims is None or claims[1] < datetime.now().timestamp():
+        return None
+    username = claims[0]
+    user = load_user_store().get(username)
+    if user is None:
+        return None
+    
+    st.session_state.session_token = token
+    st.session_state.authenticated = True
+    st.session_state.current_user = username
+    st.session_state.user_role = user["role"]
+    st.session_state.user_name = user["name"]
+    return user
+
+def end_session():
+    st.session_state.session_token = None
+    st.session_state.authenticated = False
+    st.session_state.current_user = None
+    st.session_state.user_role = None
+    st.session_state.user_name = None
+
 def login_page():
     st.markdown("""
     <div style='text-align: center; padding: 2rem;'>
@@ -157,12 +210,8 @@ def login_page():
                 if st.button("Login", use_container_width=True, type="primary"):
                     user = authenticate(username, password)
                     if user:
-                        st.session_state.authenticated = True
-                        st.session_state.current_user = username
-                        st.session_state.user_role = user["role"]
-                        st.session_state.user_name = user["name"]
-                        st.success(f"Welcome {user['name']}!")
-                        time.sleep(1)
+                        token = issue_session_token(username)
+                        st.session_state.session_token = token
                         st.rerun()
                     else:
                         st.error("Invalid credentials")
@@ -190,12 +239,8 @@ def initialize_session_state():
         st.session_state.user_role = None
     if "user_name" not in st.session_state:
         st.session_state.user_name = None
-        
-    # Task management
-    if "tasks" not in st.session_state:
-        st.session_state.tasks = create_sample_tasks()
-    if "next_task_id" not in st.session_state:
-        st.session_state.next_task_id = 1280
+    if "session_token" not in st.session_state:
+        st.session_state.session_token = None
         
     # Analytics data
     if "analytics_data" not in st.session_state:
@@ -203,6 +248,21 @@ def initialize_session_state():
     if "uploaded_files" not in st.session_state:
         st.session_state.uploaded_files = {}
 
+def initialize_task_data():
+    """Seed tasks and build their indexes; deferred until the first authenticated run"""
+    if "tasks" not in st.session_state:
+        st.session_state.tasks = create_sample_tasks()
+    if "next_task_id" not in st.session_state:
+        st.session_state.next_task_id = 1280
+    if "search_index" not in st.session_state:
+        st.session_state.search_index = build_search_index(st.session_state.tasks)
+    if "scheduler" not in st.session_state:
+        st.session_state.scheduler = create_scheduler(get_analysts(), st.session_state.tasks)
+    if "rollups" not in st.session_state:
+        st.session_state.rollups = build_rollups(st.session_state.tasks)
+    if "dedup_index" not in st.session_state:
+        st.session_state.dedup_index = build_dedup_index(st.session_state.tasks)
+
 def create_sample_tasks():
     """Create realistic sample tasks with proper structure"""
     tasks = []
@@ -235,8 +295,237 @@ def create_sample_tasks():
         })
     
     tasks.extend(sample_data)
+    for task in tasks:
+        task["Workflow"] = DEFAULT_WORKFLOW
     return tasks
 
+# ======================================
+# ASSIGNMENT SCHEDULER
+# ======================================
+
+TASK_TYPE_WEIGHTS = {"Tier I": 1, "Tier II": 2}
+LOAD_STATUSES = {"In Progress", "Paused", "Under Review"}
+PRIORITY_ORDER = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+AUTO_ASSIGN_OPTION = "Auto (Least Loaded)"
+
+def task_load(task):
+    """Weight a task adds to its assignee's queue"""
+    if task["Status"] not in LOAD_STATUSES:
+        return 0
+    return TASK_TYPE_WEIGHTS.get(task["Task_Type"], 1)
+
+def create_scheduler(analysts, tasks=()):
+    """Per-analyst load counters plus a lazily-invalidated min-heap over them"""
+    load = {analyst: 0 for analyst in analysts}
+    for task in tasks:
+        if task["Assigned_User"] in load:
+            load[task["Assigned_User"]] += task_load(task)
+    
+    heap = [(analyst_load, analyst) for analyst, analyst_load in load.items()]
+    heapq.heapify(heap)
+    return {"load": load, "heap": heap}
+
+def adjust_analyst_load(scheduler, analyst, delta):
+    """Change an analyst's load and push the new value onto the heap"""
+    load = scheduler["load"]
+    if analyst not in load or not delta:
+        return
+    load[analyst] += delta
+    heapq.heappush(scheduler["heap"], (load[analyst], analyst))
+    
+    # Stale entries are skipped on read; compact once they dominate the heap
+    if len(scheduler["heap"]) > 4 * len(load) + 16:
+        scheduler["heap"] = [(analyst_load, name) for name, analyst_load in load.items()]
+        heapq.heapify(scheduler["heap"])
+
+def release_task_load(scheduler, task):
+    adjust_analyst_load(scheduler, task["Assigned_User"], -task_load(task))
+
+def apply_task_load(scheduler, task):
+    adjust_analyst_load(scheduler, task["Assigned_User"], task_load(task))
+
+def pick_least_loaded_analyst(scheduler):
+    """Least-loaded analyst, in O(log A) amortized; every analyst in the user store is eligible"""
+    heap = scheduler["heap"]
+    load = scheduler["load"]
+    
+    while heap:
+        entry_load, name = heap[0]
+        if load.get(name) == entry_load:
+            return name
+        heapq.heappop(heap)
+    return None
+
+def reassign_task(scheduler, task, analyst):
+    """Move a task onto an analyst's queue, keeping load counters in sync"""
+    release_task_load(scheduler, task)
+    task["Assigned_User"] = analyst
+    task["Status"] = "In Progress"
+    if not task.get("Started_At"):
+        task["Started_At"] = datetime.now()
+    apply_task_load(scheduler, task)
+
+def rebalance_assignments(scheduler, tasks):
+    """Move In Progress tasks from busier analysts to the least loaded one while it narrows the gap"""
+    load = scheduler["load"]
+    movable = {analyst: [] for analyst in load}
+    for task in tasks:
+        if task["Status"] == "In Progress" and task["Assigned_User"] in movable:
+            movable[task["Assigned_User"]].append(task)
+    # Newest tasks (highest Task_ID, i.e. most recently created) move first
+    for analyst_tasks in movable.values():
+        analyst_tasks.sort(key=lambda t: t["Task_ID"])
+    
+    moves = []
+    while True:
+        idlest = pick_least_loaded_analyst(scheduler)
+        task = None
+        # The busiest analyst may have nothing movable (e.g. all Under Review), so try each in turn
+        for busiest in sorted(load, key=load.get, reverse=True):
+            gap = load[busiest] - load[idlest]
+            if gap <= 0:
+                break
+            candidates = movable[busiest]
+            for i in range(len(candidates) - 1, -1, -1):
+                if task_load(candidates[i]) < gap:
+                    task = candidates.pop(i)
+                    break
+            if task is not None:
+                break
+        if task is None:
+            return moves
+        
+        reassign_task(scheduler, task, idlest)
+        movable[idlest].append(task)
+        moves.append({"Task_ID": task["Task_ID"], "Company_Name": task["Company_Name"], "From": busiest, "To": idlest})
+
+# ======================================
+# THROUGHPUT ROLLUPS
+# ======================================
+
+COMPLETED_DATE_FORMAT = "%B %d, %Y %I:%M %p"
+ROLLUP_STEPS = {"hourly": timedelta(hours=1), "daily": timedelta(days=1)}
+ROLLUP_GROUPS = {"Analyst": 0, "Workflow": 1, "Document Type": 2}
+CYCLE_TIME_BINS_HOURS = [0.25, 0.5, 1, 2, 4, 8, 24, 48, 72, 168, float("inf")]
+
+def period_start(ts, granularity):
+    """Truncate a timestamp to the start of its hourly or daily bucket"""
+    if granularity == "hourly":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def new_rollup_bucket():
+    return {"created": 0, "created_completed": 0, "completed": 0, "weighted": 0, "cycle_count": 0, "cycle_hours": 0.0,
+            "cycle_hist": [0] * len(CYCLE_TIME_BINS_HOURS)}
+
+def merge_rollup_bucket(into, bucket):
+    into["created"] += bucket["created"]
+    into["created_completed"] += bucket["created_completed"]
+    into["completed"] += bucket["completed"]
+    into["weighted"] += bucket["weighted"]
+    into["cycle_count"] += bucket["cycle_count"]
+    into["cycle_hours"] += bucket["cycle_hours"]
+    if bucket["cycle_count"]:
+        hist = into["cycle_hist"]
+        for i, count in enumerate(bucket["cycle_hist"]):
+            hist[i] += count
+
+def create_rollups():
+    """Task rollups: {granularity: {period_start: {(analyst, workflow, document_type): bucket}}}"""
+    return {granularity: {} for granularity in ROLLUP_STEPS}
+
+def rollup_buckets(rollups, task, ts):
+    """The task's bucket at ts for every granularity, created on demand"""
+    key = (task["Assigned_User"], task.get("Workflow", DEFAULT_WORKFLOW), task["Document_Type"])
+    for granularity, periods in rollups.items():
+        buckets = periods.setdefault(period_start(ts, granularity), {})
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = new_rollup_bucket()
+        yield bucket
+
+def record_creation(rollups, task, created_at):
+    """Count a newly created task towards its workflow's workload"""
+    for bucket in rollup_buckets(rollups, task, created_at):
+        bucket["created"] += 1
+
+def record_completion(rollups, task, completed_at):
+    """Add one completed task to every rollup granularity"""
+    cycle_hours = None
+    if task.get("Started_At"):
+        cycle_hours = max((completed_at - task["Started_At"]).total_seconds() / 3600, 0.0)
+    
+    # Completions of tasks created in the same month, so completion share compares like with like
+    created_at = task.get("Created_At")
+    same_month = created_at is not None and (created_at.year, created_at.month) == (completed_at.year, completed_at.month)
+    
+    for bucket in rollup_buckets(rollups, task, completed_at):
+        bucket["completed"] += 1
+        if same_month:
+            bucket["created_completed"] += 1
+        bucket["weighted"] += TASK_TYPE_WEIGHTS.get(task["Task_Type"], 1)
+        if cycle_hours is not None:
+            bucket["cycle_count"] += 1
+            bucket["cycle_hours"] += cycle_hours
+            bucket["cycle_hist"][bisect.bisect_left(CYCLE_TIME_BINS_HOURS, cycle_hours)] += 1
+
+def build_rollups(tasks):
+    """Backfill rollups from already-completed tasks, parsing each completion date once"""
+    rollups = create_rollups()
+    for task in tasks:
+        if task["Status"] != "Completed" or not task["Tier1_Completed_Date_Time"]:
+            continue
+        try:
+            completed_at = datetime.strptime(task["Tier1_Completed_Date_Time"], COMPLETED_DATE_FORMAT)
+        except ValueError:
+            continue
+        record_completion(rollups, task, completed_at)
+    return rollups
+
+def query_rollups(rollups, start, end, granularity="daily", group_by="Analyst", by_period=True):
+    """Merge rollup buckets in [start, end) per group, optionally per period; never touches raw tasks"""
+    periods = rollups[granularity]
+    step = ROLLUP_STEPS[granularity]
+    group_idx = ROLLUP_GROUPS[group_by]
+    
+    merged = {}
+    period = period_start(start, granularity)
+    while period < end:
+        for key, bucket in periods.get(period, {}).items():
+            merged_key = (period if by_period else None, key[group_idx])
+            if merged_key not in merged:
+                merged[merged_key] = new_rollup_bucket()
+            merge_rollup_bucket(merged[merged_key], bucket)
+        period += step
+    
+    rows = []
+    for (period, group), bucket in sorted(merged.items(), key=lambda item: (item[0][0] or start, item[0][1])):
+        row = {group_by: group, **bucket}
+        if by_period:
+            row["Period"] = period
+        rows.append(row)
+    return rows
+
+def cycle_time_percentile(cycle_hist, pct):
+    """Upper edge (hours) of the histogram bin holding the given percentile, or None without data"""
+    total = sum(cycle_hist)
+    if not total:
+        return None
+    threshold = total * pct / 100
+    cumulative = 0
+    for upper, count in zip(CYCLE_TIME_BINS_HOURS, cycle_hist):
+        cumulative += count
+        if cumulative >= threshold:
+            return upper
+    return CYCLE_TIME_BINS_HOURS[-1]
+
+def format_cycle_time(hours):
+    if hours is None:
+        return "—"
+    if hours == float("inf"):
+        return f"> {CYCLE_TIME_BINS_HOURS[-2]:g}h"
+    return f"≤ {hours:g}h"
+
 # ======================================
 # TASK MANAGEMENT COMPONENTS
 # ======================================
@@ -252,8 +541,12 @@ def assign_task_to_user(task_id, user):
     """Assign a task to a user"""
     for task in st.session_state.tasks:
         if task["Task_ID"] == task_id:
+            release_task_load(st.session_state.scheduler, task)
             task["Assigned_User"] = user
             task["Status"] = "In Progress"
+            if not task.get("Started_At"):
+                task["Started_At"] = datetime.now()
+            apply_task_load(st.session_state.scheduler, task)
             return True
     return False
 
@@ -261,9 +554,14 @@ def update_task_status(task_id, new_status):
     """Update task status"""
     for task in st.session_state.tasks:
         if task["Task_ID"] == task_id:
+            was_completed = task["Status"] == "Completed"
+            release_task_load(st.session_state.scheduler, task)
             task["Status"] = new_status
-            if new_status == "Completed":
-                task["Tier1_Completed_Date_Time"] = datetime.now().strftime("%B %d, %Y %I:%M %p")
+            apply_task_load(st.session_state.scheduler, task)
+            if new_status == "Completed" and not was_completed:
+                completed_at = datetime.now()
+                task["Tier1_Completed_Date_Time"] = completed_at.strftime(COMPLETED_DATE_FORMAT)
+                record_completion(st.session_state.rollups, task, completed_at)
             return True
     return False
 
@@ -274,11 +572,40 @@ def create_new_task(task_data):
     
     task = {
         "Task_ID": task_id,
+        "Workflow": DEFAULT_WORKFLOW,
+        "Created_At": datetime.now(),
         **task_data
     }
+    if task["Status"] == "In Progress" and not task.get("Started_At"):
+        task["Started_At"] = task["Created_At"]
     st.session_state.tasks.append(task)
+    index_task(st.session_state.search_index, task)
+    record_creation(st.session_state.rollups, task, task["Created_At"])
+    add_to_dedup_index(st.session_state.dedup_index, task)
+    apply_task_load(st.session_state.scheduler, task)
     return task
 
+def auto_assign_task(task_id):
+    """Push a task to the least-loaded analyst; returns the analyst or None"""
+    analyst = pick_least_loaded_analyst(st.session_state.scheduler)
+    if analyst and assign_task_to_user(task_id, analyst):
+        return analyst
+    return None
+
+def auto_assign_pending_tasks(limit=None):
+    """Push unassigned pending tasks to analysts, highest priority first"""
+    pending = [t for t in st.session_state.tasks if t["Status"] == "Pending" and t["Assigned_User"] == "Unassigned"]
+    pending.sort(key=lambda t: (PRIORITY_ORDER.get(t["Priority"], len(PRIORITY_ORDER)), t["Task_ID"]))
+    
+    assignments = []
+    for task in pending[:limit]:
+        analyst = pick_least_loaded_analyst(st.session_state.scheduler)
+        if analyst is None:
+            break
+        reassign_task(st.session_state.scheduler, task, analyst)
+        assignments.append({"Task_ID": task["Task_ID"], "Company_Name": task["Company_Name"], "Assigned_User": analyst})
+    return assignments
+
 def task_modal(task):
     """Display task details in a modal-like expander"""
     with st.expander(f"📋 Task #{task['Task_ID']} - {task['Company_Name']} - {task['Document_Type']}", expanded=True):
@@ -331,6 +658,406 @@ def task_modal(task):
                 update_task_status(task["Task_ID"], "In Progress")
                 st.rerun()
 
+# ======================================
+# TASK SEARCH INDEX
+# ======================================
+
+SEARCH_FIELDS = ["Company_Name", "Document_Type", "Description"]
+SEARCH_MIN_FUZZY_LENGTH = 4
+SEARCH_RESULT_LIMIT = 200
+# Non-driving query tokens that expand to more terms than this are probed through one merged set
+SEARCH_MAX_PROBE_TERMS = 32
+
+def tokenize(text):
+    """Lower-case alphanumeric tokens of a text field"""
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+def term_variants(term):
+    """The term plus every single-character deletion of it, used for fuzzy lookup"""
+    return {term} | {term[:i] + term[i + 1:] for i in range(len(term))}
+
+def create_search_index():
+    """Empty inverted index: postings per term, sorted vocabulary for prefix lookup, deletion variants
+    for fuzzy lookup, and the set of task IDs for exact ID lookup"""
+    return {
+        "postings": {},
+        "terms": [],
+        "variants": {},
+        "task_ids": set()
+    }
+
+def index_task(index, task, keep_sorted=True):
+    """Add a task to the search index incrementally"""
+    task_id = task["Task_ID"]
+    # IDs are matched exactly, so they stay out of the vocabulary and the fuzzy variants
+    index["task_ids"].add(task_id)
+    
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        tokens.update(tokenize(task.get(field, "")))
+    
+    for token in tokens:
+        # Postings are insertion-ordered dicts; tasks are indexed in ascending ID order
+        postings = index["postings"].get(token)
+        if postings is None:
+            postings = index["postings"][token] = {}
+            if keep_sorted:
+                bisect.insort(index["terms"], token)
+            else:
+                index["terms"].append(token)
+            if len(token) >= SEARCH_MIN_FUZZY_LENGTH:
+                for variant in term_variants(token):
+                    index["variants"].setdefault(variant, set()).add(token)
+        postings[task_id] = None
+
+def build_search_index(tasks):
+    """Build a search index over an existing task list"""
+    index = create_search_index()
+    for task in sorted(tasks, key=lambda t: t["Task_ID"]):
+        index_task(index, task, keep_sorted=False)
+    index["terms"].sort()
+    return index
+
+def expand_query_term(index, token):
+    """Postings matching a query token: every prefix match plus an exact task ID, else terms within one edit"""
+    terms = index["terms"]
+    start = bisect.bisect_left(terms, token)
+    end = bisect.bisect_left(terms, token + "\uffff", start)
+    postings_list = [index["postings"][term] for term in terms[start:end]]
+    
+    if token.isdigit() and int(token) in index["task_ids"]:
+        postings_list.append({int(token): None})
+    
+    if not postings_list and len(token) >= SEARCH_MIN_FUZZY_LENGTH:
+        fuzzy = set()
+        for variant in term_variants(token):
+            fuzzy.update(index["variants"].get(variant, ()))
+        postings_list = [index["postings"][term] for term in sorted(fuzzy)]
+    return postings_list
+
+def iter_postings_desc(postings_list):
+    """Iterate task IDs from one or more postings, newest first, without duplicates"""
+    if len(postings_list) == 1:
+        yield from reversed(postings_list[0])
+        return
+    last = None
+    for task_id in heapq.merge(*(reversed(postings) for postings in postings_list), reverse=True):
+        if task_id != last:
+            yield task_id
+            last = task_id
+
+def search_tasks(index, query, limit=None, accept=None):
+    """Return IDs of tasks matching every token of the query, newest first.
+    
+    accept, if given, is a predicate on task IDs applied during the walk, so the limit
+    counts only tasks that also pass the caller's filters.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    
+    token_postings = []
+    for token in tokens:
+        postings_list = expand_query_term(index, token)
+        if not postings_list:
+            return []
+        token_postings.append(postings_list)
+    
+    # Walk the most selective token and probe the others, stopping once the limit is reached
+    token_postings.sort(key=lambda postings_list: sum(len(p) for p in postings_list))
+    driver, others = token_postings[0], token_postings[1:]
+    others = [
+        [set().union(*postings_list)] if len(postings_list) > SEARCH_MAX_PROBE_TERMS else postings_list
+        for postings_list in others
+    ]
+    
+    task_ids = []
+    for task_id in iter_postings_desc(driver):
+        if accept is not None and not accept(task_id):
+            continue
+        if all(any(task_id in postings for postings in postings_list) for postings_list in others):
+            task_ids.append(task_id)
+            if limit and len(task_ids) >= limit:
+                break
+    return task_ids
+
+# ======================================
+# DUPLICATE DETECTION
+# ======================================
+
+COMPANY_SUFFIXES = {
+    "the", "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "ltd",
+    "limited", "plc", "lp", "llp", "holding", "holdings", "group"
+}
+QUARTER_PATTERN = re.compile(r"^(?:q([1-4])|([1-4])q)$")
+YEAR_PATTERN = re.compile(r"^(?:fy)?((?:19|20)\d\d|\d\d)$")
+
+# MinHash/LSH over company-name trigrams: 16 bands of 2 rows surface candidates, which are
+# then confirmed with exact trigram Jaccard (0.7 keeps "Micron" and "Microchip" apart)
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 16
+FUZZY_COMPANY_THRESHOLD = 0.7
+MINHASH_PRIME = (1 << 61) - 1
+_minhash_rng = random.Random(1270)
+MINHASH_PARAMS = [(_minhash_rng.randrange(1, MINHASH_PRIME), _minhash_rng.randrange(MINHASH_PRIME))
+                  for _ in range(MINHASH_PERMUTATIONS)]
+
+def period_token(token):
+    """Normalized period for a quarter/year token (2Q, Q2, 2025, FY25), or None"""
+    match = QUARTER_PATTERN.match(token)
+    if match:
+        return f"q{match.group(1) or match.group(2)}"
+    match = YEAR_PATTERN.match(token)
+    if match and (len(match.group(1)) == 4 or token.startswith("fy")):
+        year = match.group(1)
+        return year if len(year) == 4 else f"20{year}"
+    return None
+
+def task_fingerprint(task):
+    """Normalized (company, document type, period) key; the period is read from the company name and description"""
+    company_tokens = []
+    periods = set()
+    for token in tokenize(task["Company_Name"]):
+        period = period_token(token)
+        if period:
+            periods.add(period)
+        elif token not in COMPANY_SUFFIXES:
+            company_tokens.append(token)
+    for token in tokenize(task.get("Description", "")):
+        period = period_token(token)
+        if period:
+            periods.add(period)
+    
+    company = " ".join(company_tokens) or task["Company_Name"].strip().lower()
+    return company, task["Document_Type"].strip().lower(), " ".join(sorted(periods))
+
+def company_shingles(company):
+    """Hashed character trigrams of a normalized company name"""
+    padded = f" {company} "
+    return frozenset(zlib.crc32(padded[i:i + 3].encode("utf-8")) for i in range(max(len(padded) - 2, 1)))
+
+def company_signature(shingles):
+    """MinHash signature of a company's trigram set"""
+    return tuple(min((a * x + b) % MINHASH_PRIME for x in shingles) for a, b in MINHASH_PARAMS)
+
+def lsh_keys(signature):
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    return [(band, signature[band * rows:(band + 1) * rows]) for band in range(LSH_BANDS)]
+
+def create_dedup_index(fuzzy=True):
+    """Fingerprint -> tasks, plus LSH buckets of company signatures when fuzzy matching is on"""
+    return {"fingerprints": {}, "fuzzy": fuzzy, "shingles": {}, "buckets": {}}
+
+def similar_companies(index, company):
+    """Indexed companies whose trigram Jaccard similarity clears the threshold"""
+    shingles = index["shingles"].get(company) or company_shingles(company)
+    candidates = set()
+    for key in lsh_keys(company_signature(shingles)):
+        candidates.update(index["buckets"].get(key, ()))
+    candidates.discard(company)
+    
+    similar = []
+    for other in candidates:
+        other_shingles = index["shingles"][other]
+        if len(shingles & other_shingles) / len(shingles | other_shingles) >= FUZZY_COMPANY_THRESHOLD:
+            similar.append(other)
+    return similar
+
+def find_duplicate_tasks(index, task, allow_fuzzy=True):
+    """IDs of open indexed tasks that look like the same filing.
+    
+    Completed tasks never match, so finished prior work does not block a new filing;
+    undated filings match open tasks with the same company and document type.
+    """
+    fingerprint = task_fingerprint(task)
+    company, document_type, period = fingerprint
+    
+    matches = list(index["fingerprints"].get(fingerprint, ()))
+    if allow_fuzzy and index["fuzzy"]:
+        for other in similar_companies(index, company):
+            matches.extend(index["fingerprints"].get((other, document_type, period), ()))
+    
+    return [
+        match["Task_ID"] for match in matches
+        if match["Task_ID"] != task.get("Task_ID") and match["Status"] != "Completed"
+    ]
+
+def add_to_dedup_index(index, task):
+    fingerprint = task_fingerprint(task)
+    # Task references are kept so a match's current status can be checked
+    index["fingerprints"].setdefault(fingerprint, []).append(task)
+    
+    company = fingerprint[0]
+    if index["fuzzy"] and company not in index["shingles"]:
+        shingles = index["shingles"][company] = company_shingles(company)
+        for key in lsh_keys(company_signature(shingles)):
+            index["buckets"].setdefault(key, set()).add(company)
+
+def build_dedup_index(tasks, fuzzy=True):
+    index = create_dedup_index(fuzzy)
+    for task in tasks:
+        add_to_dedup_index(index, task)
+    return index
+
+def group_duplicate_tasks(tasks, fuzzy=True):
+    """Group open tasks (oldest first) that look like the same filing, using the same rules as the insert check"""
+    tasks = [task for task in tasks if task["Status"] != "Completed"]
+    index = create_dedup_index(fuzzy)
+    parent = {}
+    
+    def find(task_id):
+        while parent[task_id] != task_id:
+            parent[task_id] = parent[parent[task_id]]
+            task_id = parent[task_id]
+        return task_id
+    
+    for task in sorted(tasks, key=lambda t: t["Task_ID"]):
+        parent[task["Task_ID"]] = task["Task_ID"]
+        for duplicate_id in find_duplicate_tasks(index, task):
+            parent[find(task["Task_ID"])] = find(duplicate_id)
+        add_to_dedup_index(index, task)
+    
+    groups = {}
+    for task in sorted(tasks, key=lambda t: t["Task_ID"]):
+        groups.setdefault(find(task["Task_ID"]), []).append(task)
+    return [group for group in groups.values() if len(group) > 1]
+
+# ======================================
+# EXPORT SUBSYSTEM
+# ======================================
+
+TASK_EXPORT_COLUMNS = [
+    "Task_ID", "Task_Type", "Company_Name", "Document_Type", "Priority",
+    "Status", "Tier1_Completed_Date_Time", "Assigned_User", "Workflow", "Description"
+]
+
+EXPORT_CHUNK_SIZE = 50_000
+
+def iter_export_chunks(rows, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield rows as lists of column values, chunk_size rows at a time"""
+    chunk = []
+    for row in rows:
+        chunk.append([row.get(col, "") for col in columns])
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def export_to_csv(rows, columns):
+    """Stream rows into a CSV file held in an in-memory buffer"""
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    for chunk in iter_export_chunks(rows, columns):
+        writer.writerows(chunk)
+    text.flush()
+    text.detach()
+    return buffer.getvalue()
+
+def export_to_parquet(rows, columns):
+    """Stream rows into a Parquet file, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    writer = None
+    for chunk in iter_export_chunks(rows, columns):
+        arrays = [list(values) for values in zip(*chunk)]
+        if writer is None:
+            table = pa.table(dict(zip(columns, arrays)))
+            writer = pq.ParquetWriter(buffer, table.schema)
+        else:
+            table = pa.Table.from_arrays(arrays, schema=writer.schema)
+        writer.write_table(table)
+    if writer is None:
+        pq.write_table(pa.table({col: pa.array([], type=pa.string()) for col in columns}), buffer)
+    else:
+        writer.close()
+    return buffer.getvalue()
+
+EXCEL_MAX_ROWS = 1_048_576
+
+def export_to_excel(sheets):
+    """Write {sheet_name: (rows, columns)} into a workbook using xlsxwriter constant_memory mode"""
+    import xlsxwriter
+
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True})
+    header_format = workbook.add_format({"bold": True, "bg_color": "#2c3e50", "font_color": "white"})
+
+    for sheet_name, (rows, columns) in sheets.items():
+        worksheet = workbook.add_worksheet(sheet_name[:31])
+        worksheet.write_row(0, 0, columns, header_format)
+        row_idx = 1
+        part = 1
+        # constant_memory flushes each row once the next one starts, so rows must be written in order
+        for chunk in iter_export_chunks(rows, columns):
+            for values in chunk:
+                if row_idx >= EXCEL_MAX_ROWS:
+                    # Continue on "<name> (2)", "<name> (3)", ... once the sheet is full
+                    part += 1
+                    suffix = f" ({part})"
+                    worksheet = workbook.add_worksheet(sheet_name[:31 - len(suffix)] + suffix)
+                    worksheet.write_row(0, 0, columns, header_format)
+                    row_idx = 1
+                if worksheet.write_row(row_idx, 0, values) == -1:
+                    raise ValueError(f"Row {row_idx} could not be written to sheet {worksheet.name}")
+                row_idx += 1
+
+    workbook.close()
+    return buffer.getvalue()
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet": {"extension": "parquet", "mime": "application/octet-stream"},
+    "Excel": {"extension": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+
+def build_export(export_format, sheets):
+    """Build export bytes for the given format; CSV/Parquet use the first sheet only"""
+    if export_format == "Excel":
+        return export_to_excel(sheets)
+    rows, columns = next(iter(sheets.values()))
+    if export_format == "Parquet":
+        return export_to_parquet(rows, columns)
+    return export_to_csv(rows, columns)
+
+def render_export_controls(key, file_prefix, sheets_factory):
+    """Offer export download buttons; the file is built only when requested"""
+    if "exports" not in st.session_state:
+        st.session_state.exports = {}
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        export_format = st.selectbox("Export Format", list(EXPORT_FORMATS), key=f"export_format_{key}")
+    with col2:
+        st.write("")
+        if st.button("📦 Prepare Export", key=f"export_prepare_{key}", use_container_width=True):
+            st.session_state.exports.pop(key, None)
+            try:
+                data = build_export(export_format, sheets_factory())
+                st.session_state.exports[key] = (export_format, data)
+            except ImportError as e:
+                st.error(f"{export_format} export is unavailable: {str(e)}")
+
+    # Only the most recent export is kept, and only until it is downloaded or the format changes
+    prepared = st.session_state.exports.get(key)
+    if prepared and prepared[0] != export_format:
+        del st.session_state.exports[key]
+    elif prepared:
+        fmt = EXPORT_FORMATS[export_format]
+        st.download_button(
+            f"⬇️ Download {export_format}",
+            data=prepared[1],
+            file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt['extension']}",
+            mime=fmt["mime"],
+            key=f"export_download_{key}",
+            on_click=lambda: st.session_state.exports.pop(key, None),
+            use_container_width=True
+        )
+
 # ======================================
 # MAIN APPLICATION TABS
 # ======================================
@@ -417,6 +1144,7 @@ def tab_task_management():
     """Task management with Get Next Task functionality"""
     st.markdown("### # My Task | All Task")
     st.markdown("#### Search Task Information")
+    search_query = st.text_input("Search", placeholder="Company, document type or description", label_visibility="collapsed")
     
     # Get Next Task functionality
     next_task = get_next_task()
@@ -469,8 +1197,18 @@ def tab_task_management():
     
     filtered_tasks = [t for t in filtered_tasks if t["Priority"] in priority_filter and t["Task_Type"] in task_type_filter]
     
+    search_truncated = False
+    if search_query:
+        filtered_ids = {t["Task_ID"] for t in filtered_tasks}
+        matching_ids = set(search_tasks(st.session_state.search_index, search_query,
+                                        limit=SEARCH_RESULT_LIMIT, accept=filtered_ids.__contains__))
+        search_truncated = len(matching_ids) >= SEARCH_RESULT_LIMIT
+        filtered_tasks = [t for t in filtered_tasks if t["Task_ID"] in matching_ids]
+    
     # Display tasks
     st.markdown(f"#### {view_option} ({len(filtered_tasks)} tasks)")
+    if search_truncated:
+        st.caption(f"Search is limited to the {SEARCH_RESULT_LIMIT} newest matches; refine the query to narrow it down.")
     
     if not filtered_tasks:
         st.info("No tasks match the current filters.")
@@ -519,10 +1257,13 @@ def tab_task_management():
                 document_type = st.selectbox("Document Type", ["10-Q", "10-K", "8-K", "Annual Report"])
                 task_type = st.selectbox("Task Type", ["Tier I", "Tier II"])
                 priority = st.selectbox("Priority", ["Low", "Medium", "High", "Critical"])
+                workflow_names = [w["Workflow Name"] for w in PREDEFINED_WORKFLOWS]
+                workflow = st.selectbox("Workflow", workflow_names, index=workflow_names.index(DEFAULT_WORKFLOW))
             
             with col2:
-                assigned_user = st.selectbox("Assign To", ["Unassigned"] + ANALYSTS)
+                assigned_user = st.selectbox("Assign To", ["Unassigned", AUTO_ASSIGN_OPTION] + get_analysts())
                 description = st.text_area("Description")
+                allow_duplicate = st.checkbox("Create even if a duplicate exists")
             
             if st.form_submit_button("Create Task", type="primary"):
                 if company_name:
@@ -531,41 +1272,89 @@ def tab_task_management():
                         "Company_Name": company_name,
                         "Document_Type": document_type,
                         "Priority": priority,
-                        "Status": "Pending" if assigned_user == "Unassigned" else "In Progress",
+                        "Status": "Pending" if assigned_user in ("Unassigned", AUTO_ASSIGN_OPTION) else "In Progress",
                         "Tier1_Completed_Date_Time": "",
-                        "Assigned_User": assigned_user
+                        "Assigned_User": "Unassigned" if assigned_user == AUTO_ASSIGN_OPTION else assigned_user,
+                        "Workflow": workflow,
+                        "Description": description
                     }
                     
-                    task = create_new_task(task_data)
-                    st.success(f"Task #{task['Task_ID']} created successfully!")
-                    st.rerun()
+                    duplicates = find_duplicate_tasks(st.session_state.dedup_index, task_data)
+                    if duplicates and not allow_duplicate:
+                        st.warning(f"Possible duplicate of task(s) {', '.join(f'#{i}' for i in duplicates)}. "
+                                   "Tick the checkbox to create it anyway.")
+                    else:
+                        task = create_new_task(task_data)
+                        if assigned_user == AUTO_ASSIGN_OPTION:
+                            auto_assign_task(task["Task_ID"])
+                        st.success(f"Task #{task['Task_ID']} created successfully!")
+                        st.rerun()
                 else:
                     st.error("Please enter a company name")
+        
+        # Duplicate detection over the existing backlog
+        st.markdown("---")
+        st.markdown("### 🧬 Duplicate Detection")
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            fuzzy_matching = st.checkbox("Fuzzy company-name matching (MinHash/LSH)", value=True)
+        
+        with col2:
+            scan_backlog = st.button("🔍 Scan Backlog", use_container_width=True)
+        
+        if scan_backlog:
+            groups = group_duplicate_tasks(st.session_state.tasks, fuzzy=fuzzy_matching)
+            if not groups:
+                st.success("No duplicate tasks found.")
+            else:
+                st.warning(f"Found {len(groups)} group(s) covering {sum(len(g) for g in groups)} tasks")
+                duplicate_rows = []
+                for group_no, group in enumerate(groups, start=1):
+                    for task in group:
+                        duplicate_rows.append({
+                            "Group": group_no,
+                            "Task_ID": task["Task_ID"],
+                            "Company_Name": task["Company_Name"],
+                            "Document_Type": task["Document_Type"],
+                            "Period": task_fingerprint(task)[2] or "—",
+                            "Status": task["Status"],
+                            "Assigned_User": task["Assigned_User"]
+                        })
+                st.dataframe(pd.DataFrame(duplicate_rows), use_container_width=True)
 
-def tab_analyst_performance():
-    """Analyst performance tracking"""
-    st.markdown("### 👥 Analyst Performance")
+PERFORMANCE_REPORT_COLUMNS = ["Analyst", "Total Tasks", "Completed", "In Progress", "Pending", "Completion Rate"]
+
+def build_performance_report(tasks):
+    """Per-analyst task counts and completion rate, computed in a single pass over tasks"""
+    counts = {analyst: {"Total Tasks": 0, "Completed": 0, "In Progress": 0, "Pending": 0} for analyst in get_analysts()}
+    
+    for task in tasks:
+        analyst_counts = counts.get(task["Assigned_User"])
+        if analyst_counts is None:
+            continue
+        analyst_counts["Total Tasks"] += 1
+        if task["Status"] in analyst_counts:
+            analyst_counts[task["Status"]] += 1
     
-    # Calculate performance metrics
     performance_data = []
-    
-    for analyst in ANALYSTS:
-        analyst_tasks = [t for t in st.session_state.tasks if t["Assigned_User"] == analyst]
-        total_tasks = len(analyst_tasks)
-        completed_tasks = len([t for t in analyst_tasks if t["Status"] == "Completed"])
-        in_progress_tasks = len([t for t in analyst_tasks if t["Status"] == "In Progress"])
-        pending_tasks = len([t for t in analyst_tasks if t["Status"] == "Pending"])
-        
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
+    for analyst, analyst_counts in counts.items():
+        total_tasks = analyst_counts["Total Tasks"]
+        completion_rate = (analyst_counts["Completed"] / total_tasks * 100) if total_tasks > 0 else 0
         performance_data.append({
             "Analyst": analyst,
-            "Total Tasks": total_tasks,
-            "Completed": completed_tasks,
-            "In Progress": in_progress_tasks,
-            "Pending": pending_tasks,
+            **analyst_counts,
             "Completion Rate": f"{completion_rate:.1f}%"
         })
+    return performance_data
+
+def tab_analyst_performance():
+    """Analyst performance tracking"""
+    st.markdown("### 👥 Analyst Performance")
+    
+    # Calculate performance metrics
+    performance_data = build_performance_report(st.session_state.tasks)
     
     performance_df = pd.DataFrame(performance_data)
     
@@ -588,6 +1377,129 @@ def tab_analyst_performance():
         fig = px.bar(completion_df, x='Analyst', y='Completion Rate Num',
                      title='Completion Rate by Analyst')
         st.plotly_chart(fig, use_container_width=True)
+    
+    # Throughput trends, served from the rollups
+    st.markdown("#### 📈 Throughput Trends")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        trend_range = st.selectbox("Range", ["Last 24 Hours", "Last 7 Days", "Last 30 Days", "Last 90 Days", "Last 365 Days"], index=2)
+    
+    with col2:
+        trend_group = st.selectbox("Group By", list(ROLLUP_GROUPS))
+    
+    with col3:
+        trend_metric = st.selectbox("Metric", ["Completed", "Weighted (Tier II = 2)"])
+    
+    now = datetime.now()
+    range_days = {"Last 24 Hours": 1, "Last 7 Days": 7, "Last 30 Days": 30, "Last 90 Days": 90, "Last 365 Days": 365}[trend_range]
+    granularity = "hourly" if range_days <= 2 else "daily"
+    trend_start = now - timedelta(days=range_days)
+    trend_end = period_start(now, granularity) + ROLLUP_STEPS[granularity]
+    metric_key = "completed" if trend_metric == "Completed" else "weighted"
+    
+    trend_rows = query_rollups(st.session_state.rollups, trend_start, trend_end, granularity, trend_group)
+    if trend_rows:
+        trend_df = pd.DataFrame(trend_rows)
+        fig = px.line(trend_df, x="Period", y=metric_key, color=trend_group, markers=True,
+                      title=f"{trend_metric} Tasks per {'Hour' if granularity == 'hourly' else 'Day'}")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        summary = query_rollups(st.session_state.rollups, trend_start, trend_end, granularity, trend_group, by_period=False)
+        st.dataframe(pd.DataFrame([{
+            trend_group: row[trend_group],
+            "Completed": row["completed"],
+            "Weighted": row["weighted"],
+            "Avg Cycle Time (h)": f"{row['cycle_hours'] / row['cycle_count']:.2f}" if row["cycle_count"] else "—",
+            "P50 Cycle Time": format_cycle_time(cycle_time_percentile(row["cycle_hist"], 50)),
+            "P90 Cycle Time": format_cycle_time(cycle_time_percentile(row["cycle_hist"], 90)),
+        } for row in summary]), use_container_width=True)
+    else:
+        st.info("No completed tasks in the selected range.")
+    
+    # Monthly target progress
+    st.markdown("#### 🎯 Monthly Target Progress")
+    
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_totals = {
+        row["Workflow"]: row
+        for row in query_rollups(st.session_state.rollups, month_start, trend_end, "daily", "Workflow", by_period=False)
+    }
+    
+    target_rows = []
+    for workflow in PREDEFINED_WORKFLOWS:
+        name = workflow["Workflow Name"]
+        target = workflow["Monthly Target"]
+        totals = month_totals.get(name, new_rollup_bucket())
+        progress = None
+        if workflow["Target Metric"] == "Completion %":
+            # Share of this month's new tasks that were also completed this month
+            if totals["created"]:
+                actual = totals["created_completed"] / totals["created"] * 100
+                progress = actual / float(target.rstrip("%")) * 100
+                actual_display = f"{actual:.1f}%"
+            else:
+                actual_display = "No tasks created this month"
+        elif target.endswith("%"):
+            # Accuracy-type targets need QA data the task list does not record
+            actual_display = "Not tracked"
+        else:
+            progress = totals["completed"] / float(target) * 100
+            actual_display = str(totals["completed"])
+        target_rows.append({
+            "Workflow": name,
+            "Target Metric": workflow["Target Metric"],
+            "Monthly Target": target,
+            "Actual": actual_display,
+            "Progress": None if progress is None else min(progress, 100),
+        })
+    
+    st.dataframe(
+        pd.DataFrame(target_rows),
+        use_container_width=True,
+        column_config={"Progress": st.column_config.ProgressColumn("Progress", min_value=0, max_value=100, format="%.0f%%")}
+    )
+    
+    # Workload balancing (for managers)
+    if st.session_state.user_role == "manager":
+        st.markdown("#### ⚖️ Workload Balancing")
+        
+        load_df = pd.DataFrame(
+            [{"Analyst": analyst, "Load": load} for analyst, load in st.session_state.scheduler["load"].items()]
+        ).sort_values("Load", ascending=False)
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            fig = px.bar(load_df, x='Analyst', y='Load',
+                         title='Weighted Queue Load (In Progress, Paused, Under Review)')
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            if st.button("⚡ Auto-Assign Pending Tasks", use_container_width=True):
+                st.session_state.last_balancing = ("Assigned", auto_assign_pending_tasks())
+                st.rerun()
+            if st.button("🔄 Rebalance Queues", use_container_width=True):
+                st.session_state.last_balancing = ("Moved", rebalance_assignments(st.session_state.scheduler, st.session_state.tasks))
+                st.rerun()
+            
+            if st.session_state.get("last_balancing"):
+                action, changes = st.session_state.last_balancing
+                st.success(f"{action} {len(changes)} task(s)")
+                if changes:
+                    st.dataframe(pd.DataFrame(changes), use_container_width=True)
+    
+    # Export
+    st.markdown("#### 📦 Export Performance Report")
+    render_export_controls(
+        "analyst_performance",
+        "analyst_performance",
+        lambda: {
+            "Performance": (performance_data, PERFORMANCE_REPORT_COLUMNS),
+            "Tasks": (st.session_state.tasks, TASK_EXPORT_COLUMNS),
+        }
+    )
 
 def tab_advanced_analytics():
     """Advanced analytics with Excel upload"""
@@ -683,6 +1595,8 @@ def tab_advanced_analytics():
     if eml_files:
         st.success(f"✅ {len(eml_files)} .eml file(s) uploaded successfully!")
         
+        import_duplicates = st.checkbox("Create tasks even if a duplicate exists", key="eml_allow_duplicates")
+        
         if st.button("Process Emails and Create Tasks"):
             for eml_file in eml_files:
                 # Create task from email
@@ -696,6 +1610,14 @@ def tab_advanced_analytics():
                     "Assigned_User": "Unassigned"
                 }
                 
+                # Filenames are too similar to each other for fuzzy matching; only exact fingerprints
+                # count, so re-importing the same file is caught
+                duplicates = find_duplicate_tasks(st.session_state.dedup_index, task_data, allow_fuzzy=False)
+                if duplicates and not import_duplicates:
+                    st.warning(f"Possible duplicate of task(s) {', '.join(f'#{i}' for i in duplicates)}: "
+                               f"{eml_file.name} was not imported. Tick the checkbox to create it anyway.")
+                    continue
+                
                 task = create_new_task(task_data)
                 st.success(f"Created Task #{task['Task_ID']} from {eml_file.name}")
 
@@ -733,21 +1655,20 @@ def tab_workflow_setup():
     # Pre-defined workflows based on your requirements
     st.markdown("#### Pre-defined Workflows")
     
-    predefined_workflows = [
-        {"Workflow Name": "Trades Tape Imports", "Workflow Type": "Volume", "Target Metric": "Completion %", 
-         "Measurement Unit": "Batches", "Monthly Target": "100%", "Priority": "High", "SLA Hours": 24, "Quality Required?": "Yes"},
-        {"Workflow Name": "Pending", "Workflow Type": "Volume", "Target Metric": "Completion %", 
-         "Measurement Unit": "Items", "Monthly Target": "100%", "Priority": "High", "SLA Hours": 72, "Quality Required?": "Yes"},
-        {"Workflow Name": "Placements", "Workflow Type": "Target", "Target Metric": "Placements", 
-         "Measurement Unit": "Cases", "Monthly Target": "50", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
-        {"Workflow Name": "Judgments", "Workflow Type": "Target", "Target Metric": "Accuracy %", 
-         "Measurement Unit": "Judgments", "Monthly Target": "98%", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
-        {"Workflow Name": "UCC", "Workflow Type": "Target", "Target Metric": "UCC Filings", 
-         "Measurement Unit": "Filings", "Monthly Target": "30", "Priority": "Medium", "SLA Hours": 72, "Quality Required?": "Yes"},
-    ]
     
-    workflows_df = pd.DataFrame(predefined_workflows)
+    workflows_df = pd.DataFrame(PREDEFINED_WORKFLOWS)
     st.dataframe(workflows_df, use_container_width=True)
+    
+    # Export
+    st.markdown("#### 📦 Export Workflows and Tasks")
+    render_export_controls(
+        "workflow_setup",
+        "workflows",
+        lambda: {
+            "Tasks": (st.session_state.tasks, TASK_EXPORT_COLUMNS),
+            "Workflows": (PREDEFINED_WORKFLOWS, list(workflows_df.columns)),
+        }
+    )
 
 # ======================================
 # MAIN APPLICATION
@@ -755,6 +1676,7 @@ def tab_workflow_setup():
 
 def main_app():
     """Main application after login"""
+    initialize_task_data()
     
     # Header
     st.markdown(f"""
@@ -790,10 +1712,7 @@ def main_app():
     # Logout button
     st.sidebar.markdown("---")
     if st.sidebar.button("🚪 Logout"):
-        st.session_state.authenticated = False
-        st.session_state.current_user = None
-        st.session_state.user_role = None
-        st.session_state.user_name = None
+        end_session()
         st.rerun()
 
 # ======================================
@@ -803,7 +1722,8 @@ def main_app():
 def main():
     initialize_session_state()
     
-    if not st.session_state.authenticated:
+    if get_session_user() is None:
+        end_session()
         login_page()
     else:
         main_app()
@@ -0,0 +1,207 @@
+"""Benchmarks for ARMS Workflow Management.
+
+Usage:
+    python benchmarks.py scheduler [--analysts 10] [--hours 160] [--rate 12] [--seed 7]
+    python benchmarks.py startup [--repeat 5]
+"""
+import argparse
+import heapq
+import os
+import random
+import statistics
+import subprocess
+import sys
+from collections import deque
+
+# ======================================
+# SCHEDULER SIMULATION
+# ======================================
+
+SERVICE_HOURS = {"Tier I": 0.5, "Tier II": 1.0}
+
+def generate_arrivals(rate, hours, rng):
+    """Poisson task arrivals as (time, task_type, base service hours)"""
+    arrivals = []
+    t = rng.expovariate(rate)
+    while t < hours:
+        task_type = rng.choice(["Tier I", "Tier II"])
+        arrivals.append((t, task_type, rng.expovariate(1 / SERVICE_HOURS[task_type])))
+        t += rng.expovariate(rate)
+    return arrivals
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def simulate_pull(arrivals, analysts, speeds, hours, rng, poll_hours=0.25, manual_share=0.3):
+    """Current model: a shared Pending queue analysts pull from when they check in,
+    plus a share of tasks hand-assigned by a manager to an arbitrary analyst"""
+    shared = deque()
+    personal = {a: deque() for a in analysts}
+    busy = {a: False for a in analysts}
+    events = [(rng.expovariate(1 / poll_hours), 1, "poll", a) for a in analysts]
+    events += [(t, 0, "arrival", i) for i, (t, _, _) in enumerate(arrivals)]
+    heapq.heapify(events)
+    queue_times, completed = [], 0
+
+    def start_next(now, analyst):
+        queue = personal[analyst] or shared
+        if not queue:
+            return False
+        i = queue.popleft()
+        queue_times.append(now - arrivals[i][0])
+        busy[analyst] = True
+        heapq.heappush(events, (now + arrivals[i][2] * speeds[analyst], 1, "done", analyst))
+        return True
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if now > hours:
+            break
+        if kind == "arrival":
+            if rng.random() < manual_share:
+                personal[rng.choice(analysts)].append(payload)
+            else:
+                shared.append(payload)
+        elif kind == "done":
+            completed += 1
+            busy[payload] = False
+            if not start_next(now, payload):
+                heapq.heappush(events, (now + rng.expovariate(1 / poll_hours), 1, "poll", payload))
+        elif kind == "poll" and not busy[payload]:
+            if not start_next(now, payload):
+                heapq.heappush(events, (now + rng.expovariate(1 / poll_hours), 1, "poll", payload))
+
+    return completed, queue_times
+
+def simulate_push(arrivals, analysts, speeds, hours, rng):
+    """Scheduler model: each arrival is pushed to the least-loaded analyst's queue"""
+    from arms_workflow import create_scheduler, pick_least_loaded_analyst, apply_task_load, release_task_load
+
+    scheduler = create_scheduler(analysts)
+    personal = {a: deque() for a in analysts}
+    busy = {a: False for a in analysts}
+    events = [(t, 0, "arrival", i) for i, (t, _, _) in enumerate(arrivals)]
+    heapq.heapify(events)
+    queue_times, completed = [], 0
+
+    def start_next(now, analyst):
+        if not personal[analyst]:
+            busy[analyst] = False
+            return
+        i, task = personal[analyst].popleft()
+        queue_times.append(now - arrivals[i][0])
+        busy[analyst] = True
+        heapq.heappush(events, (now + arrivals[i][2] * speeds[analyst], 1, "done", (analyst, task)))
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if now > hours:
+            break
+        if kind == "arrival":
+            analyst = pick_least_loaded_analyst(scheduler)
+            task = {"Task_Type": arrivals[payload][1], "Status": "In Progress", "Assigned_User": analyst}
+            apply_task_load(scheduler, task)
+            personal[analyst].append((payload, task))
+            if not busy[analyst]:
+                start_next(now, analyst)
+        else:
+            analyst, task = payload
+            completed += 1
+            release_task_load(scheduler, task)
+            start_next(now, analyst)
+
+    return completed, queue_times
+
+def bench_scheduler(args):
+    rng = random.Random(args.seed)
+    analysts = [f"Analyst {i + 1}" for i in range(args.analysts)]
+    speeds = {a: rng.lognormvariate(0, 0.25) for a in analysts}
+    arrivals = generate_arrivals(args.rate, args.hours, rng)
+
+    results = {
+        "pull": simulate_pull(arrivals, analysts, speeds, args.hours, random.Random(args.seed + 1)),
+        "push": simulate_push(arrivals, analysts, speeds, args.hours, random.Random(args.seed + 1)),
+    }
+
+    print(f"{len(arrivals)} tasks over {args.hours}h, {args.analysts} analysts, {args.rate} tasks/h")
+    print(f"{'model':<6} {'done':>7} {'tasks/h':>8} {'p50 q(h)':>9} {'p90 q(h)':>9} {'p99 q(h)':>9}")
+    for model, (completed, queue_times) in results.items():
+        print(f"{model:<6} {completed:>7} {completed / args.hours:>8.2f} "
+              f"{percentile(queue_times, 50):>9.2f} {percentile(queue_times, 90):>9.2f} {percentile(queue_times, 99):>9.2f}")
+
+# ======================================
+# STARTUP BENCHMARK
+# ======================================
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["pandas", "numpy", "plotly"]
+
+# Each probe runs in a fresh interpreter so nothing is already in sys.modules
+STARTUP_PROBES = {
+    "eager heavy imports": """
+import time
+t = time.perf_counter()
+import pandas, numpy, plotly.express, plotly.graph_objects
+print(time.perf_counter() - t)
+""",
+    "app module import": """
+import time
+t = time.perf_counter()
+import arms_workflow
+print(time.perf_counter() - t)
+""",
+    "login page first paint": """
+import time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file("arms_workflow.py", default_timeout=120).run()
+print(time.perf_counter() - t)
+""",
+}
+
+LOADED_MODULES_PROBE = """
+import sys
+from streamlit.testing.v1 import AppTest
+AppTest.from_file("arms_workflow.py", default_timeout=120).run()
+print(",".join(m for m in %r if m in sys.modules))
+""" % HEAVY_MODULES
+
+def run_probe(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    lines = result.stdout.strip().splitlines()
+    return lines[-1] if lines else ""
+
+def bench_startup(args):
+    print(f"{'probe':<24} {'median (s)':>11} {'min (s)':>9}")
+    for name, code in STARTUP_PROBES.items():
+        timings = [float(run_probe(code)) for _ in range(args.repeat)]
+        print(f"{name:<24} {statistics.median(timings):>11.3f} {min(timings):>9.3f}")
+    print(f"heavy modules loaded by login page: {run_probe(LOADED_MODULES_PROBE) or 'none'}")
+
+# ======================================
+# MAIN EXECUTION
+# ======================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    scheduler = subparsers.add_parser("scheduler", help="Compare pull vs. push assignment in a queue simulation")
+    scheduler.add_argument("--analysts", type=int, default=10)
+    scheduler.add_argument("--hours", type=float, default=160)
+    scheduler.add_argument("--rate", type=float, default=12, help="Task arrivals per hour")
+    scheduler.add_argument("--seed", type=int, default=7)
+    scheduler.set_defaults(func=bench_scheduler)
+
+    startup = subparsers.add_parser("startup", help="Time cold imports and the first login page render")
+    startup.add_argument("--repeat", type=int, default=5)
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()